@@ -7,15 +7,19 @@ Run with:
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import os
+import time
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import List, Literal, Dict, Any, Optional
+from typing import Callable, List, Literal, Dict, Any, Optional
 from urllib.parse import urlparse
 
+import orjson
 from firecrawl import FirecrawlApp
-from pydantic import BaseModel, Field, HttpUrl
+from openai import AsyncOpenAI
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl
 from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Prompt
@@ -25,10 +29,24 @@ import logfire
 from dotenv import load_dotenv
 
 load_dotenv()
-logfire.configure(send_to_logfire='if-token-present')
+
+# Guard so re-executions of this module (e.g. Streamlit hot reloads) don't
+# reconfigure logfire
+_logfire_configured = False
+
+
+def _configure_logfire() -> None:
+    """Configure logfire once per process; repeat calls are no-ops."""
+    global _logfire_configured
+    if not _logfire_configured:
+        logfire.configure(send_to_logfire='if-token-present')
+        _logfire_configured = True
+
+
+_configure_logfire()
 
 # Platform-specific constraints
-PLATFORM_LIMITS = {
+PLATFORM_LIMITS: Dict[str, int] = {
     'twitter': 280,
     'linkedin': 3000,
     'facebook': 63206,
@@ -42,6 +60,95 @@ DEFAULT_TONE = "informative and engaging"
 # Output directory for saved posts
 OUTPUTS_DIR = Path("outputs")
 
+# Cache directory and TTL for scraped website content
+CACHE_DIR = OUTPUTS_DIR / ".cache"
+CACHE_TTL_SECONDS = 3600
+
+# Per-provider concurrency caps so bulk runs stay under the Firecrawl and
+# OpenAI rate limits instead of triggering 429s and retry backoff
+FIRECRAWL_SEM = asyncio.Semaphore(5)
+OPENAI_SEM = asyncio.Semaphore(20)
+
+# Shared API clients, created lazily so one HTTP connection pool serves
+# every request in the process instead of re-paying TCP/TLS setup per call
+_firecrawl_client: FirecrawlApp | None = None
+_openai_client: AsyncOpenAI | None = None
+
+
+def get_firecrawl() -> FirecrawlApp:
+    """Return the shared FirecrawlApp client, creating it on first use."""
+    global _firecrawl_client
+    if _firecrawl_client is None:
+        api_key = os.getenv("FIRECRAWL_API_KEY")
+        if not api_key:
+            raise ValueError(
+                "FIRECRAWL_API_KEY environment variable is required")
+        _firecrawl_client = FirecrawlApp(api_key=api_key)
+    return _firecrawl_client
+
+
+def get_openai_client() -> AsyncOpenAI:
+    """Return the shared AsyncOpenAI client, creating it on first use."""
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = AsyncOpenAI()
+    return _openai_client
+
+
+def _cache_path(url: str) -> Path:
+    """Return the cache file path for a URL, keyed by its SHA-256 digest."""
+    return CACHE_DIR / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+
+def _load_cached_content(url: str) -> WebsiteContent | None:
+    """Load cached website content for a URL, or None if missing or stale."""
+    path = _cache_path(url)
+    try:
+        if time.time() - path.stat().st_mtime > CACHE_TTL_SECONDS:
+            return None
+        return WebsiteContent.model_validate_json(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _store_cached_content(url: str, content: WebsiteContent) -> None:
+    """Store scraped website content in the cache."""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    _cache_path(url).write_text(content.model_dump_json())
+
+
+def render_hashtags(tags: List[str]) -> str:
+    """Render hashtags as a single space-separated display string."""
+    # List comp rather than a generator: hashtags are capped at 5 items,
+    # where the list build is cheaper than generator frame resumes
+    return " ".join(["#" + tag for tag in tags])
+
+
+def _iter_markdown_chunks(url: str, preferences: ContentPreferences, posts: List[SocialMediaPost]):
+    """Yield markdown fragments for the saved posts document."""
+    yield (
+        f"# Generated Social Media Posts\n\n"
+        f"**Source URL:** {url}\n\n"
+        f"**Generated at:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+        f"**Target Audience:** {preferences.audience}\n"
+        f"**Content Tone:** {preferences.tone}\n\n"
+        f"## Generated Posts\n\n"
+    )
+
+    for i, post in enumerate(posts):
+        yield (
+            f"### {post.platform.title()}\n"
+            f"```\n"
+            f"{post.content}\n"
+            f"```\n\n"
+            f"**Hashtags:**\n"
+            f"{render_hashtags(post.hashtags)}\n\n"
+        )
+        # Two blank lines between consecutive posts, matching the original
+        # join-based rendering
+        if i < len(posts) - 1:
+            yield "\n"
+
 
 def save_posts_to_markdown(url: str, preferences: ContentPreferences, posts: List[SocialMediaPost]) -> Path:
     """Save generated posts to a markdown file.
@@ -62,30 +169,10 @@ def save_posts_to_markdown(url: str, preferences: ContentPreferences, posts: Lis
     filename = f"social_media_posts_{timestamp}.md"
     filepath = OUTPUTS_DIR / filename
 
-    # Generate markdown content
-    content = [
-        "# Generated Social Media Posts\n",
-        f"**Source URL:** {url}\n",
-        f"**Generated at:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n",
-        f"**Target Audience:** {preferences.audience}",
-        f"**Content Tone:** {preferences.tone}\n",
-        "## Generated Posts\n"
-    ]
-
-    # Add each platform's posts
-    for post in posts:
-        content.extend([
-            f"### {post.platform.title()}",
-            "```",
-            post.content,
-            "```\n",
-            "**Hashtags:**",
-            " ".join(f"#{tag}" for tag in post.hashtags),
-            "\n"
-        ])
-
-    # Write to file
-    filepath.write_text("\n".join(content))
+    # Stream each chunk straight to disk rather than materializing the
+    # whole document in memory first
+    with filepath.open('w') as f:
+        f.writelines(_iter_markdown_chunks(url, preferences, posts))
     return filepath
 
 
@@ -97,6 +184,8 @@ class ContentPreferences(BaseModel):
 
 class WebsiteContent(BaseModel):
     """Extracted content from a website."""
+    model_config = ConfigDict(frozen=True)
+
     title: str = Field(description="The title of the webpage")
     description: str = Field(
         description="Meta description or summary of the webpage")
@@ -107,6 +196,8 @@ class WebsiteContent(BaseModel):
 
 class SocialMediaPost(BaseModel):
     """A social media post optimized for a specific platform."""
+    model_config = ConfigDict(frozen=True)
+
     platform: Literal['twitter', 'linkedin', 'facebook', 'instagram']
     content: str = Field(description="The main content of the post")
     hashtags: List[str] = Field(
@@ -115,6 +206,8 @@ class SocialMediaPost(BaseModel):
 
 class FirecrawlMetadata(BaseModel):
     """Metadata from FireCrawl response."""
+    model_config = ConfigDict(extra='ignore')
+
     url: Optional[str] = None
     title: Optional[str] = None
     description: Optional[str] = None
@@ -130,11 +223,13 @@ class FirecrawlMetadata(BaseModel):
 
 class FirecrawlResponse(BaseModel):
     """FireCrawl API response structure based on actual response."""
+    model_config = ConfigDict(extra='ignore')
+
     markdown: str
     metadata: FirecrawlMetadata
 
 
-@dataclass
+@dataclass(slots=True)
 class Deps:
     firecrawl: FirecrawlApp
     website_content: WebsiteContent | None = None
@@ -160,14 +255,14 @@ content_extraction_agent = Agent(
 post_generation_agent = Agent(
     'openai:gpt-4o-mini',
     deps_type=Deps,
-    result_type=List[SocialMediaPost],
+    result_type=SocialMediaPost,
     system_prompt="""
-    You are a social media content expert. Your job is to create engaging, platform-optimized posts from website content.
+    You are a social media content expert. Your job is to create an engaging, platform-optimized post from website content.
     Follow these guidelines:
-    1. Each post should be tailored to the platform's style and character limits
+    1. The post should be tailored to the requested platform's style and character limit
     2. Include relevant hashtags (max 5) that will increase visibility
     3. Add a compelling call-to-action with the website URL
-    4. Maintain the brand's voice while adapting to each platform's unique style
+    4. Maintain the brand's voice while adapting to the platform's unique style
     5. If available, reference the author or publication date to add credibility
     6. Adapt the content to match the specified target audience and tone
     7. If no audience or tone is specified, use a general professional audience and informative tone
@@ -175,31 +270,76 @@ post_generation_agent = Agent(
 )
 
 
-@content_extraction_agent.tool
-async def fetch_webpage(ctx: RunContext[Deps], url: str) -> WebsiteContent:
-    """Fetch and extract content from a webpage using FireCrawl.
+async def extract_website_content(firecrawl: FirecrawlApp, url: str) -> WebsiteContent:
+    """Scrape a URL with FireCrawl and build a WebsiteContent from it.
 
     Args:
-        ctx: The context containing the FireCrawl client
+        firecrawl: The FireCrawl client
         url: The URL to fetch content from
     Returns:
         WebsiteContent object containing the extracted information
     """
-    # Use FireCrawl to scrape the URL and get clean content
-    response = ctx.deps.firecrawl.scrape_url(url)
-
-    # Parse the response using our Pydantic model
-    firecrawl_response = FirecrawlResponse(**response)
+    # Serve recently scraped URLs from the local cache, skipping the
+    # Firecrawl round-trip entirely
+    cached = _load_cached_content(url)
+    if cached is not None:
+        return cached
+
+    # Use FireCrawl to scrape the URL and get clean content; the SDK is
+    # synchronous, so run it in a worker thread to keep the event loop
+    # free for concurrent agent calls
+    async with FIRECRAWL_SEM:
+        response = await asyncio.to_thread(firecrawl.scrape_url, url)
+
+    # Parse the response using our Pydantic model; model_validate walks the
+    # dict in pydantic-core rather than through Python-level keyword
+    # arguments
+    firecrawl_response = FirecrawlResponse.model_validate(response)
 
     # Extract relevant information from the response
     metadata = firecrawl_response.metadata
 
-    return WebsiteContent(
+    content = WebsiteContent(
         title=metadata.title or "Untitled",
         description=metadata.description or metadata.ogDescription or "",
         main_content=firecrawl_response.markdown,
         url=metadata.sourceURL or url
     )
+    _store_cached_content(url, content)
+    return content
+
+
+@content_extraction_agent.tool
+async def fetch_webpage(ctx: RunContext[Deps], url: str) -> WebsiteContent:
+    """Fetch and extract content from a webpage using FireCrawl.
+
+    Args:
+        ctx: The context containing the FireCrawl client
+        url: The URL to fetch content from
+    Returns:
+        WebsiteContent object containing the extracted information
+    """
+    return await extract_website_content(ctx.deps.firecrawl, url)
+
+
+async def _get_website_content(firecrawl: FirecrawlApp, deps: Deps, url: str) -> WebsiteContent:
+    """Get website content directly, falling back to the extraction agent.
+
+    Firecrawl's metadata and markdown already contain everything
+    WebsiteContent needs, so building it directly skips an entire LLM
+    round-trip per URL. The extraction agent only runs when the scrape
+    comes back without a usable title.
+    """
+    content = await extract_website_content(firecrawl, url)
+    if content.title != "Untitled":
+        return content
+
+    async with OPENAI_SEM:
+        content_result = await content_extraction_agent.run(
+            _EXTRACTION_PROMPT_TMPL.format_map({"url": url}),
+            deps=deps
+        )
+    return content_result.data
 
 
 def get_content_preferences(console: Console) -> ContentPreferences:
@@ -222,38 +362,297 @@ def get_content_preferences(console: Console) -> ContentPreferences:
     return ContentPreferences(audience=audience, tone=tone)
 
 
-async def generate_social_posts(url: str, preferences: ContentPreferences) -> List[SocialMediaPost]:
-    """Generate social media posts from a website URL."""
+# Upper bound on how much scraped markdown goes into the generation prompt
+MAX_PROMPT_CONTENT_CHARS = 16000
+
+# Prompt templates built once at import; per-call work is reduced to
+# substituting the placeholders via str.format_map
+_POST_PROMPT_TMPL = """Create a social media post for {platform} (character limit: {limit}) using this content:
+        Title: {title}
+        Description: {description}
+        Content: {content}
+        URL: {url}
+
+        Target Audience: {audience}
+        Tone of Voice: {tone}
+
+        Make sure the post is tailored to the specified audience and maintains the desired tone."""
+
+_EXTRACTION_PROMPT_TMPL = (
+    "Please extract content from {url} and create a WebsiteContent object "
+    "with the information."
+)
+
+
+def _condense(markdown: str, max_chars: int = MAX_PROMPT_CONTENT_CHARS) -> str:
+    """Trim markdown to its leading blocks to bound prompt size.
+
+    Firecrawl can return tens of thousands of characters for a long
+    article, which balloons token cost and latency. The opening headings
+    and paragraphs carry most of the signal for social posts, so keep
+    whole blocks from the top until the character budget is spent.
+    """
+    if len(markdown) <= max_chars:
+        return markdown
+
+    kept = []
+    used = 0
+    for block in markdown.split("\n\n"):
+        if used + len(block) + 2 > max_chars:
+            break
+        kept.append(block)
+        used += len(block) + 2
+
+    # Fall back to a hard cut if the first block alone exceeds the budget
+    return "\n\n".join(kept) if kept else markdown[:max_chars]
+
+
+def build_post_prompt(platform: str, website_content: WebsiteContent, preferences: ContentPreferences) -> str:
+    """Build the user prompt for generating a single platform's post."""
+    return _POST_PROMPT_TMPL.format_map({
+        "platform": platform,
+        "limit": PLATFORM_LIMITS[platform],
+        "title": website_content.title,
+        "description": website_content.description,
+        "content": _condense(website_content.main_content),
+        "url": website_content.url,
+        "audience": preferences.audience,
+        "tone": preferences.tone,
+    })
+
+
+async def generate_social_posts(
+    url: str,
+    preferences: ContentPreferences,
+    platforms: Optional[List[str]] = None,
+) -> List[SocialMediaPost]:
+    """Generate social media posts from a website URL.
+
+    Args:
+        url: The source URL to generate posts for
+        preferences: Content generation preferences
+        platforms: Platforms to generate posts for; defaults to all of them
+
+    Returns:
+        One post per requested platform
+    """
+    platforms = platforms or list(PLATFORM_LIMITS)
     # Initialize FireCrawl with API key
-    api_key = os.getenv("FIRECRAWL_API_KEY")
-    if not api_key:
-        raise ValueError("FIRECRAWL_API_KEY environment variable is required")
+    firecrawl_app = get_firecrawl()
+    deps = Deps(firecrawl=firecrawl_app, preferences=preferences)
 
-    firecrawl_app = FirecrawlApp(api_key=api_key)
+    # Extract content from website
+    deps.website_content = await _get_website_content(firecrawl_app, deps, url)
+
+    # Generate posts for each platform concurrently; the work is I/O-bound on
+    # the OpenAI API, so wall-clock time is the slowest single call rather
+    # than the sum of all of them
+    async def generate_post_for_platform(platform: str) -> SocialMediaPost:
+        async with OPENAI_SEM:
+            result = await post_generation_agent.run(
+                build_post_prompt(platform, deps.website_content, preferences),
+                deps=deps
+            )
+        return result.data
+
+    posts = await asyncio.gather(
+        *[generate_post_for_platform(platform) for platform in platforms]
+    )
+    return list(posts)
+
+
+async def stream_social_posts(
+    url: str,
+    preferences: ContentPreferences,
+    platforms: Optional[List[str]] = None,
+    on_update: Optional[Callable[[str, SocialMediaPost], None]] = None,
+) -> List[SocialMediaPost]:
+    """Generate posts concurrently, reporting partial output as it streams.
+
+    Works like generate_social_posts, but runs each platform's call
+    through the agent's streaming API. pydantic-ai validates the partial
+    JSON with allow_partial as tokens arrive, and each partially filled
+    SocialMediaPost is passed to on_update(platform, partial) so callers
+    can render drafts progressively instead of waiting on a spinner.
+
+    Args:
+        url: The source URL to generate posts for
+        preferences: Content generation preferences
+        platforms: Platforms to generate posts for; defaults to all of them
+        on_update: Called with each partial post, then the final one
+
+    Returns:
+        One completed post per requested platform
+    """
+    platforms = platforms or list(PLATFORM_LIMITS)
+    firecrawl_app = get_firecrawl()
     deps = Deps(firecrawl=firecrawl_app, preferences=preferences)
 
     # Extract content from website
-    content_result = await content_extraction_agent.run(
-        f"Please extract content from {url} and create a WebsiteContent object with the information.",
-        deps=deps
+    deps.website_content = await _get_website_content(firecrawl_app, deps, url)
+
+    async def stream_post_for_platform(platform: str) -> SocialMediaPost:
+        async with OPENAI_SEM:
+            async with post_generation_agent.run_stream(
+                build_post_prompt(platform, deps.website_content, preferences),
+                deps=deps
+            ) as result:
+                async for partial in result.stream():
+                    if on_update is not None:
+                        on_update(platform, partial)
+                post = await result.get_data()
+        if on_update is not None:
+            on_update(platform, post)
+        return post
+
+    posts = await asyncio.gather(
+        *[stream_post_for_platform(platform) for platform in platforms]
+    )
+    return list(posts)
+
+
+class BatchProcessor:
+    """Process multiple URLs concurrently with a bounded level of parallelism.
+
+    A semaphore caps how many URLs are in flight at once so large batches
+    don't overwhelm the Firecrawl and OpenAI rate limits.
+    """
+
+    def __init__(self, max_concurrency: int = 10):
+        self.max_concurrency = max_concurrency
+
+    async def run(
+        self,
+        urls: List[str],
+        preferences: ContentPreferences,
+        platforms: Optional[List[str]] = None,
+    ) -> List[List[SocialMediaPost] | Exception]:
+        """Generate posts for each URL, returning results in input order.
+
+        Failures are returned as the raised exception in that URL's slot
+        rather than aborting the whole batch.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def process_url(url: str) -> List[SocialMediaPost]:
+            async with semaphore:
+                return await generate_social_posts(url, preferences, platforms)
+
+        return await asyncio.gather(
+            *[process_url(url) for url in urls], return_exceptions=True
+        )
+
+
+async def generate_social_posts_batch(
+    urls: List[str],
+    preferences: ContentPreferences,
+    platforms: Optional[List[str]] = None,
+    max_concurrency: int = 10,
+) -> List[List[SocialMediaPost] | Exception]:
+    """Generate social media posts for multiple URLs concurrently."""
+    return await BatchProcessor(max_concurrency=max_concurrency).run(
+        urls, preferences, platforms)
+
+
+# Polling intervals for OpenAI Batch API jobs (seconds)
+BATCH_POLL_INITIAL_DELAY = 5.0
+BATCH_POLL_MAX_DELAY = 60.0
+
+# JSON output instructions appended to batch prompts, since Batch API
+# requests bypass pydantic-ai's structured result handling
+BATCH_JSON_INSTRUCTIONS = """
+        Respond with a single JSON object with these keys:
+        - "platform": the target platform name (lowercase)
+        - "content": the post content as a string
+        - "hashtags": a list of at most 5 hashtag strings (without the # prefix)"""
+
+
+async def submit_batch_generation(
+    urls: List[str],
+    preferences: ContentPreferences,
+    platforms: Optional[List[str]] = None,
+) -> Dict[str, List[SocialMediaPost]]:
+    """Generate posts for multiple URLs through the OpenAI Batch API.
+
+    The Batch API costs 50% less per token than the live completions
+    endpoint but completes asynchronously (up to 24 hours), so this path
+    suits large offline jobs where cost matters more than turnaround.
+    Content extraction still runs live since Firecrawl has no batch
+    endpoint; only the per-platform post generation calls are batched.
+
+    Args:
+        urls: The source URLs to generate posts for
+        preferences: Content generation preferences
+        platforms: Platforms to generate posts for; defaults to all of them
+
+    Returns:
+        Mapping of URL to its generated posts
+    """
+    platforms = platforms or list(PLATFORM_LIMITS)
+    firecrawl_app = get_firecrawl()
+    deps = Deps(firecrawl=firecrawl_app, preferences=preferences)
+
+    # Extract content from each website
+    contents: Dict[str, WebsiteContent] = {}
+    for url in urls:
+        contents[url] = await _get_website_content(firecrawl_app, deps, url)
+
+    # Build one request line per (url, platform) pair
+    request_lines = []
+    for index, url in enumerate(urls):
+        for platform in platforms:
+            prompt = build_post_prompt(platform, contents[url], preferences)
+            request_lines.append(orjson.dumps({
+                "custom_id": f"{index}:{platform}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": "gpt-4o-mini",
+                    "messages": [
+                        {"role": "user", "content": prompt + BATCH_JSON_INSTRUCTIONS},
+                    ],
+                    "response_format": {"type": "json_object"},
+                },
+            }))
+
+    # Upload the JSONL payload and create the batch job; orjson.dumps
+    # already returns bytes, so the lines join without re-encoding. The
+    # filename matters: the Files endpoint requires a .jsonl extension
+    # for purpose="batch" and rejects the bare-bytes default
+    client = get_openai_client()
+    batch_file = await client.files.create(
+        file=("batch_requests.jsonl", b"\n".join(request_lines)),
+        purpose="batch"
     )
-    deps.website_content = content_result.data
-
-    # Generate posts for each platform
-    posts_result = await post_generation_agent.run(
-        f"""Create social media posts for all platforms using this content:
-        Title: {deps.website_content.title}
-        Description: {deps.website_content.description}
-        Content: {deps.website_content.main_content}
-        URL: {deps.website_content.url}
-        
-        Target Audience: {preferences.audience}
-        Tone of Voice: {preferences.tone}
-        
-        Make sure the posts are tailored to the specified audience and maintain the desired tone.""",
-        deps=deps
+    batch = await client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
     )
-    return posts_result.data
+
+    # Poll until the job reaches a terminal state, backing off exponentially
+    delay = BATCH_POLL_INITIAL_DELAY
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, BATCH_POLL_MAX_DELAY)
+        batch = await client.batches.retrieve(batch.id)
+
+    if batch.status != "completed":
+        raise RuntimeError(f"Batch job {batch.id} ended with status: {batch.status}")
+
+    # Parse results back into SocialMediaPost objects
+    output = await client.files.content(batch.output_file_id)
+    posts_by_url: Dict[str, List[SocialMediaPost]] = {url: [] for url in urls}
+    for line in output.text.splitlines():
+        if not line.strip():
+            continue
+        entry = orjson.loads(line)
+        index_str, _, _ = entry["custom_id"].partition(":")
+        message = entry["response"]["body"]["choices"][0]["message"]["content"]
+        posts_by_url[urls[int(index_str)]].append(
+            SocialMediaPost.model_validate_json(message))
+
+    return posts_by_url
 
 
 async def main():
@@ -292,7 +691,7 @@ async def main():
 
         for post in posts:
             console.print(Panel(
-                f"{post.content}\n\n[blue]Hashtags:[/blue] {' '.join(f'#{tag}' for tag in post.hashtags)}",
+                f"{post.content}\n\n[blue]Hashtags:[/blue] {render_hashtags(post.hashtags)}",
                 title=f"[bold]{post.platform.title()}[/bold]",
                 border_style="green"
             ))
@@ -2,14 +2,20 @@
 
 import asyncio
 import os
+import threading
+import time
 from pathlib import Path
 
 import streamlit as st
 from dotenv import load_dotenv
 
 from social_media_agent import (
+    PLATFORM_LIMITS,
     ContentPreferences,
-    generate_social_posts,
+    generate_social_posts_batch,
+    stream_social_posts,
+    submit_batch_generation,
+    render_hashtags,
     save_posts_to_markdown,
     DEFAULT_AUDIENCE,
     DEFAULT_TONE,
@@ -33,29 +39,84 @@ PLATFORM_MAPPING = {
     "Instagram": "instagram"
 }
 
-PLATFORM_LIMITS = {
-    "Twitter (X)": "280 characters",
-    "LinkedIn": "3,000 characters",
-    "Facebook": "63,206 characters",
-    "Instagram": "2,200 characters"
+# Precomputed lookups so per-render calls are O(1) dict hits instead of
+# scanning PLATFORM_MAPPING or re-parsing display strings
+INTERNAL_TO_DISPLAY = {v: k for k, v in PLATFORM_MAPPING.items()}
+
+# Display strings derived once from the shared integer limits
+PLATFORM_LIMITS_DISPLAY = {
+    display: f"{PLATFORM_LIMITS[internal]:,} characters"
+    for display, internal in PLATFORM_MAPPING.items()
 }
 
 
+@st.cache_resource
+def get_agents():
+    """Return the shared pydantic-ai agents, constructed once per process.
+
+    Pinning them behind st.cache_resource keeps the agents (and the
+    pydantic-core schemas built for their result types) alive across
+    Streamlit script hot-reloads instead of rebuilding them.
+    """
+    from social_media_agent import content_extraction_agent, post_generation_agent
+    return content_extraction_agent, post_generation_agent
+
+
+@st.cache_resource
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """Return a persistent event loop running in a daemon thread.
+
+    Reusing one loop across button clicks keeps the HTTP connection pools
+    to OpenAI and Firecrawl warm instead of tearing them down with
+    asyncio.run on every click.
+    """
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return loop
+
+
+def run_async(coro):
+    """Run a coroutine on the persistent event loop and wait for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop()).result()
+
+
 def get_display_name(platform: str) -> str:
     """Get the display name for a platform from its internal name."""
-    for display_name, internal_name in PLATFORM_MAPPING.items():
-        if internal_name == platform:
-            return display_name
-    return platform.title()
+    return INTERNAL_TO_DISPLAY.get(platform, platform.title())
 
 
 def get_character_limit(platform: str) -> int:
     """Get the character limit for a platform."""
-    limit_str = PLATFORM_LIMITS[get_display_name(platform)]
-    return int(limit_str.split()[0].replace(",", ""))
+    return PLATFORM_LIMITS[platform]
+
+
+def display_posts(posts, key_prefix: str = ""):
+    """Display generated posts in per-platform tabs."""
+    tabs = st.tabs([get_display_name(p.platform) for p in posts])
+    for tab, post in zip(tabs, posts):
+        with tab:
+            st.text_area(
+                "Content",
+                value=post.content,
+                height=150,
+                help="Copy this content to your clipboard",
+                key=f"{key_prefix}content_{post.platform}"
+            )
+            st.markdown("**Hashtags:**")
+            st.markdown(render_hashtags(post.hashtags))
+
+            # Character count
+            char_count = len(post.content)
+            char_limit = get_character_limit(post.platform)
+            st.progress(min(1.0, char_count / char_limit))
+            st.caption(
+                f"Character count: {char_count} / {char_limit}")
 
 
 def main():
+    # Keep the agents (and their pydantic-core schemas) alive across reruns
+    get_agents()
+
     # Header
     st.title("🚀 Social Media Content Generator")
     st.markdown("""
@@ -67,11 +128,12 @@ def main():
     col1, col2 = st.columns([2, 1])
 
     with col1:
-        # URL input
-        url = st.text_input(
-            "Website URL",
+        # URL input (one per line for batch processing)
+        url_input = st.text_area(
+            "Website URLs",
             placeholder="https://example.com",
-            help="Enter the URL of the website you want to create posts for"
+            help="Enter one URL per line; multiple URLs are processed concurrently",
+            height=100
         )
 
         # Content preferences
@@ -90,19 +152,29 @@ def main():
     with col2:
         st.subheader("Platform Selection")
         selected_platforms = {}
-        for display_name, limit in PLATFORM_LIMITS.items():
+        for display_name, limit in PLATFORM_LIMITS_DISPLAY.items():
             selected_platforms[PLATFORM_MAPPING[display_name]] = st.checkbox(
                 f"{display_name} ({limit})",
                 value=True
             )
 
+        st.subheader("Processing Options")
+        batch_mode = st.checkbox(
+            "Batch mode (cheaper, slower)",
+            value=False,
+            help="Route generation through the OpenAI Batch API at 50% of "
+                 "the cost. Jobs can take up to 24 hours to complete."
+        )
+
     # Generate button
     if st.button("Generate Posts", type="primary"):
-        if not url:
-            st.error("Please enter a website URL")
+        urls = [u.strip() for u in url_input.splitlines() if u.strip()]
+        if not urls:
+            st.error("Please enter at least one website URL")
             return
 
-        if not any(selected_platforms.values()):
+        platforms = [p for p, selected in selected_platforms.items() if selected]
+        if not platforms:
             st.error("Please select at least one platform")
             return
 
@@ -114,46 +186,84 @@ def main():
                     tone=tone
                 )
 
-                # Generate posts
-                posts = asyncio.run(generate_social_posts(url, preferences))
-
-                # Save to markdown
-                output_file = save_posts_to_markdown(url, preferences, posts)
-
-                # Display results in tabs
-                st.success(
-                    f"Generated posts have been saved to: {output_file}")
-
-                # Create tabs using display names
-                tabs = st.tabs([get_display_name(p.platform) for p in posts])
-                for tab, post in zip(tabs, posts):
-                    with tab:
-                        st.text_area(
-                            "Content",
-                            value=post.content,
-                            height=150,
-                            help="Copy this content to your clipboard",
-                            key=f"content_{post.platform}"
+                if batch_mode:
+                    # Route through the OpenAI Batch API; this can take a
+                    # long time, so warn the user before blocking
+                    st.info(
+                        "Batch job submitted to OpenAI; waiting for "
+                        "completion. This may take a while.")
+                    posts_by_url = run_async(
+                        submit_batch_generation(urls, preferences, platforms))
+
+                    for i, url in enumerate(urls):
+                        with st.expander(url, expanded=False):
+                            posts = posts_by_url[url]
+                            output_file = save_posts_to_markdown(
+                                url, preferences, posts)
+                            st.caption(f"Saved to: {output_file}")
+                            display_posts(posts, key_prefix=f"batch{i}_")
+                elif len(urls) == 1:
+                    # Single URL: stream drafts into per-platform
+                    # placeholders while generation runs on the
+                    # background loop
+                    url = urls[0]
+                    placeholders = {p: st.empty() for p in platforms}
+                    partials = {}
+
+                    def on_update(platform, partial):
+                        # Called from the event-loop thread; stash the
+                        # partial post for the polling loop below to render
+                        partials[platform] = partial
+
+                    future = asyncio.run_coroutine_threadsafe(
+                        stream_social_posts(
+                            url, preferences, platforms, on_update),
+                        get_event_loop())
+
+                    while not future.done():
+                        for platform, partial in list(partials.items()):
+                            content = getattr(partial, "content", None)
+                            if content:
+                                placeholders[platform].markdown(
+                                    f"**{get_display_name(platform)} "
+                                    f"(draft)**\n```\n{content}\n```")
+                        time.sleep(0.3)
+
+                    posts = future.result()
+                    for placeholder in placeholders.values():
+                        placeholder.empty()
+
+                    # Save to markdown
+                    output_file = save_posts_to_markdown(url, preferences, posts)
+
+                    # Display results in tabs
+                    st.success(
+                        f"Generated posts have been saved to: {output_file}")
+                    display_posts(posts)
+
+                    # Download button for markdown file
+                    with open(output_file, 'r') as f:
+                        st.download_button(
+                            label="Download Markdown File",
+                            data=f.read(),
+                            file_name=output_file.name,
+                            mime="text/markdown"
                         )
-                        st.markdown("**Hashtags:**")
-                        st.markdown(
-                            " ".join(f"#{tag}" for tag in post.hashtags))
-
-                        # Character count
-                        char_count = len(post.content)
-                        char_limit = get_character_limit(post.platform)
-                        st.progress(min(1.0, char_count / char_limit))
-                        st.caption(
-                            f"Character count: {char_count} / {char_limit}")
-
-                # Download button for markdown file
-                with open(output_file, 'r') as f:
-                    st.download_button(
-                        label="Download Markdown File",
-                        data=f.read(),
-                        file_name=output_file.name,
-                        mime="text/markdown"
-                    )
+                else:
+                    # Multiple URLs: process the batch concurrently
+                    results = run_async(
+                        generate_social_posts_batch(urls, preferences, platforms))
+
+                    for i, (url, result) in enumerate(zip(urls, results)):
+                        with st.expander(url, expanded=False):
+                            if isinstance(result, Exception):
+                                st.error(f"Error: {str(result)}")
+                                continue
+
+                            output_file = save_posts_to_markdown(
+                                url, preferences, result)
+                            st.caption(f"Saved to: {output_file}")
+                            display_posts(result, key_prefix=f"url{i}_")
 
         except Exception as e:
             st.error(f"Error: {str(e)}")